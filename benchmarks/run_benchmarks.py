@@ -0,0 +1,317 @@
+# run_benchmarks.py - Offline performance benchmarks for the advisor pipeline
+#
+# Covers NLP analysis, name resolution, data loading and indexing,
+# retrieval and end-to-end answer generation.
+# Runs without network access: the Groq API is replaced by a mock and the
+# faculty corpus is synthetic. HuggingFace / spaCy models must already be
+# in the local cache (cases whose models are missing are skipped).
+#
+# Usage (from the repo root):
+#   python benchmarks/run_benchmarks.py --faculty 5000
+#   python benchmarks/run_benchmarks.py --save-baseline      # record baseline
+#   python benchmarks/run_benchmarks.py --check               # fail on regressions
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+OUTPUT_PATH = os.path.join(ROOT, "benchmarks", "bench_output.json")
+
+AREAS = [
+    "Artificial Intelligence", "Machine Learning", "Cybersecurity", "Privacy",
+    "Blockchain", "Human-Computer Interaction", "CS Education", "Computer Vision",
+    "Pattern Recognition", "AI Ethics", "Systems Engineering", "Compilers",
+    "Databases", "Distributed Systems", "Natural Language Processing", "Robotics",
+]
+TERMS = ["Spring 2026", "Fall 2026", "Open Now", "Not taking students currently"]
+FIRST = ["Jun", "Gaby", "Jerry", "Elisa", "Hoda", "Jim", "Maria", "Ken", "Priya", "Omar"]
+LAST = ["Zhuang", "Dagher", "Fails", "Smith", "Mehrpouyan", "Buffenbarger", "Lopez", "Chen"]
+
+QUERIES = [
+    "Hello, how are you?",
+    "Who does AI research?",
+    "Which professors are available in Spring 2026?",
+    "Tell me about Dr. Jun Zhuang",
+    "I'm interested in computer vision and machine learning, who should I talk to?",
+    "How do I choose an advisor?",
+]
+
+
+# ==================== SYNTHETIC DATA ====================
+
+def make_faculty(n, seed=0):
+    """
+    Synthetic faculty records (same format as data/mock_professors.json),
+    plus the real mock faculty so name lookups in QUERIES resolve.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        records.append({
+            "name": f"Dr. {rng.choice(FIRST)} {rng.choice(LAST)}{i}",
+            "areas": rng.sample(AREAS, 2),
+            "availability": rng.choice(TERMS),
+        })
+    with open(os.path.join(ROOT, "data", "mock_professors.json")) as f:
+        records.extend(json.load(f))
+    return records
+
+
+def make_corpus(faculty, path):
+    """Write faculty records as a professors CSV (same columns as data/professors.csv)."""
+    import csv
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Research_Areas", "Summary"])
+        for record in faculty:
+            areas = record["areas"]
+            writer.writerow([
+                record["name"],
+                ", ".join(areas),
+                f"Studies {areas[0].lower()} with applications to {areas[-1].lower()}.",
+            ])
+    return path
+
+
+def mock_groq_post(*args, **kwargs):
+    """Stand-in for requests.post: returns a fixed Groq-style response."""
+    response = mock.Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "choices": [{"message": {"content": "Dr. Jun Zhuang works on AI."}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 400, "completion_tokens": 12, "total_tokens": 412},
+    }
+    return response
+
+
+# ==================== TIMING ====================
+
+def measure(func, repeats, warmup=1):
+    """Run func `warmup + repeats` times and return latency stats in ms."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "repeats": repeats,
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+# ==================== CASES ====================
+
+def bench_nlp(results, repeats, faculty):
+    from name_index import NameIndex
+    from nlp_engine import NLPEngine
+    engine = NLPEngine(name_index=NameIndex(faculty))
+    query = itertools.cycle(QUERIES)
+
+    results["nlp_intent"] = measure(
+        lambda: engine.classifier(next(query), candidate_labels=engine.labels), repeats)
+
+    def keywords():
+        text = next(query).lower()  # one query per call, as in analyze_query
+        return [w for w in engine.keywords if w.lower() in text]
+    results["nlp_keywords"] = measure(keywords, repeats * 10)
+    results["nlp_ner"] = measure(lambda: engine.nlp(next(query)), repeats)
+    results["nlp_analyze_query"] = measure(lambda: engine.analyze_query(next(query)), repeats)
+
+
+# Name resolution must get these right before it is timed:
+# query -> expected professor ids (score >= MIN_SCORE, i.e. used by the engines)
+NAME_CASES = {
+    "Can I talk to Zhuang about it?": ["jun-zhuang"],
+    "tell me about jun zhuang": ["jun-zhuang"],
+    "Is Dr. Fails available?": ["jerry-alan-fails"],
+    "What does Barney Smith research?": ["elisa-barney-smith"],
+    "Tell me about Dr. Jun Zhuang and Gaby Dagher": ["jun-zhuang", "gaby-dagher"],
+    "What happens if my thesis defense fails?": [],
+    "Can you help me plan my first semester?": [],
+    "What is a baby step for research?": [],
+    "What are the tails of a distribution?": [],
+    "I got junk mail": [],
+}
+
+
+def check_names(index):
+    """Raise if any NAME_CASES query resolves to the wrong professors."""
+    from name_index import MIN_SCORE
+    wrong = []
+    for query, expected in NAME_CASES.items():
+        found = [p["id"] for p in index.resolve(query) if p["score"] >= MIN_SCORE]
+        if found != expected:
+            wrong.append(f"{query!r}: expected {expected}, got {found}")
+    if wrong:
+        raise AssertionError("name resolution: " + "; ".join(wrong))
+
+
+def bench_names(results, repeats, faculty):
+    from name_index import NameIndex
+    index = NameIndex(faculty)
+    check_names(index)
+    query = itertools.cycle(QUERIES + ["is zhaung available?", "What does Barney Smith research?"])
+    results["name_resolve"] = measure(lambda: index.resolve(next(query)), repeats * 10)
+
+
+def bench_retrieval(results, repeats, csv_path, k):
+    from older_version.data_loader import load_data, build_index
+    from older_version.rag_engine import retrieve_info
+
+    results["load_data"] = measure(lambda: load_data(csv_path), repeats)
+    df = load_data(csv_path)
+    built = {}
+
+    def build():
+        built["model"], built["index"], _ = build_index(df)
+    # Index builds are slow, so fewer samples - but never just one
+    build_repeats = max(3, repeats // 5)
+    results["build_index"] = measure(build, build_repeats)
+
+    query = itertools.cycle(QUERIES)
+    results[f"retrieve_info_top{k}"] = measure(
+        lambda: retrieve_info(next(query), built["model"], built["index"], df, k=k), repeats)
+
+    from older_version.data_loader import build_index_streaming
+    streamed = {}
+
+    def build_streaming():
+        streamed["model"], streamed["index"], streamed["texts"] = build_index_streaming(
+            csv_path, chunksize=max(1, len(df) // 4), progress=None)
+    results["build_index_streaming"] = measure(build_streaming, build_repeats)
+    results[f"retrieve_info_streaming_top{k}"] = measure(
+        lambda: retrieve_info(next(query), streamed["model"], streamed["index"],
+                              streamed["texts"], k=k), repeats)
+
+
+def bench_end_to_end(results, repeats, faculty):
+    import response_engine
+    from matcher import AdvisorMatcher
+    from name_index import NameIndex
+    with mock.patch.dict(os.environ, {"GROQ_API_KEY": "benchmark"}), \
+            mock.patch.object(response_engine.requests, "post", side_effect=mock_groq_post):
+        # Same wiring as engines.get_response_engine(), over the synthetic faculty
+        engine = response_engine.ResponseEngine(
+            matcher=AdvisorMatcher(faculty),
+            name_index=NameIndex(faculty),
+        )
+        history = [
+            {"role": "user", "content": "Who does AI research?"},
+            {"role": "assistant", "content": "Dr. Jun Zhuang works on AI."},
+        ]
+        query = itertools.cycle(QUERIES)
+        results["generate_answer"] = measure(
+            lambda: engine.generate_answer(next(query), history=history), repeats)
+
+
+def run(faculty, repeats, k):
+    results = {}
+    skipped = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        records = make_faculty(faculty)
+        csv_path = make_corpus(records, os.path.join(tmp, "professors.csv"))
+        cases = [
+            ("nlp", lambda: bench_nlp(results, repeats, records)),
+            ("names", lambda: bench_names(results, repeats, records)),
+            ("retrieval", lambda: bench_retrieval(results, repeats, csv_path, k)),
+            ("end_to_end", lambda: bench_end_to_end(results, repeats, records)),
+        ]
+        for name, case in cases:
+            try:
+                case()
+            except Exception as e:  # missing model / package - keep going
+                skipped[name] = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Skipped {name}: {skipped[name]}")
+
+    return {
+        "config": {"faculty": faculty, "repeats": repeats, "k": k},
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+# ==================== BASELINE ====================
+
+def compare(report, baseline, tolerance, min_delta_ms=0.5):
+    """
+    List of regressions: cases whose p50 is more than `tolerance` (fraction)
+    slower than the baseline - and at least `min_delta_ms` slower, so timer
+    noise on very fast cases is not flagged - and baseline cases missing from the
+    report (skipped or crashed). New cases without a baseline are ignored.
+    """
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        stats = report["results"].get(name)
+        if stats is None:
+            reasons = "; ".join(f"{case}: {why}" for case, why in report["skipped"].items())
+            regressions.append(f"{name}: missing from this run ({reasons or 'not measured'})")
+            continue
+        limit = base["p50_ms"] + max(base["p50_ms"] * tolerance, min_delta_ms)
+        if stats["p50_ms"] > limit:
+            regressions.append(
+                f"{name}: p50 {stats['p50_ms']:.2f}ms > {limit:.2f}ms "
+                f"(baseline {base['p50_ms']:.2f}ms)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline advisor pipeline benchmarks")
+    parser.add_argument("--faculty", type=int, default=1000, help="synthetic corpus size")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--k", type=int, default=5, help="top-k for retrieval")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown as a fraction of the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="slowdowns smaller than this are never regressions")
+    args = parser.parse_args(argv)
+
+    report = run(args.faculty, args.repeats, args.k)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline} (run with --save-baseline first)")
+            return 1
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("❌ Performance regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
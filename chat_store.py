@@ -0,0 +1,148 @@
+# chat_store.py - Persistent chat history with a bounded in-memory window
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import deque
+
+DB_PATH = "data/chat_history.db"
+
+# Signs session tokens so only ids issued by this server are accepted.
+# Set CHAT_HISTORY_SECRET to keep old links working across restarts;
+# without it a random secret is used and history links last one process.
+SESSION_SECRET = os.getenv("CHAT_HISTORY_SECRET") or secrets.token_hex(32)
+
+
+def _sign(session_id, secret):
+    return hmac.new(secret.encode(), session_id.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def new_session_token(secret=SESSION_SECRET):
+    """Create a random session id and return it as a signed token "<id>.<signature>"."""
+    session_id = secrets.token_hex(16)
+    return f"{session_id}.{_sign(session_id, secret)}"
+
+
+def session_from_token(token, secret=SESSION_SECRET):
+    """
+    Session id from a signed token, or None if the token is missing,
+    malformed or was not issued with this secret.
+
+    Note: a valid token is a bearer credential - anyone holding the full
+    link can read that conversation, so it should not be shared.
+    """
+    if not token or "." not in token:
+        return None
+    session_id, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _sign(session_id, secret)):
+        return None
+    return session_id
+
+
+class ChatStore:
+    """
+    SQLite store holding every message of every session.
+    One store is shared by the whole server process (see engines.py).
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)"
+        )
+        self._conn.commit()
+
+    def append(self, session_id, role, content):
+        """Save one message and return it (with its id)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (session_id, role, content, time.time()),
+            )
+            self._conn.commit()
+        return {"id": cursor.lastrowid, "role": role, "content": content}
+
+    def page(self, session_id, limit, before_id=None):
+        """
+        Up to `limit` messages older than `before_id` (or the newest ones),
+        returned oldest first.
+        """
+        query = "SELECT id, role, content FROM messages WHERE session_id = ?"
+        params = [session_id]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {"id": row[0], "role": row[1], "content": row[2]}
+            for row in reversed(rows)
+        ]
+
+    def count(self, session_id):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+
+
+class ChatWindow:
+    """
+    One session's view of its conversation.
+
+    Only the last `size` messages are kept in memory and rendered, so each
+    turn costs the same no matter how long the conversation gets. Older
+    messages stay in the ChatStore and are paged in on demand.
+    """
+
+    def __init__(self, store, session_id, size=20):
+        self.store = store
+        self.session_id = session_id
+        self.messages = deque(store.page(session_id, size), maxlen=size)
+        # Counted once here and kept up to date by append(), not per rerun
+        self._total = store.count(session_id)
+
+    def append(self, role, content):
+        """Save a message and add it to the window (oldest one drops out)."""
+        self.messages.append(self.store.append(self.session_id, role, content))
+        self._total += 1
+
+    def history(self):
+        """Recent messages in the format expected by generate_answer."""
+        return [{"role": m["role"], "content": m["content"]} for m in self.messages]
+
+    def older(self, pages=1, page_size=20):
+        """Messages before the window, `pages` pages back (oldest first)."""
+        if not self.messages:
+            return []
+        return self.store.page(
+            self.session_id, pages * page_size, before_id=self.messages[0]["id"]
+        )
+
+    def older_count(self):
+        """How many messages exist before the in-memory window."""
+        return self._total - len(self.messages)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
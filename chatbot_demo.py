@@ -3,9 +3,15 @@
 # It uses Streamlit to create a web-based chat interface
 
 import streamlit as st
-from response_engine import ResponseEngine
+from chat_store import ChatWindow, new_session_token, session_from_token
+from engines import get_chat_store, get_matcher, get_response_engine, memory_report
+from matcher import format_matches
+from metrics import METRICS
 import os
 
+# Number of recent messages kept in memory and shown on each rerun
+HISTORY_WINDOW = 20
+
 # ===== MANUALLY LOAD .ENV FILE =====
 # For some reason python-dotenv doesn't work automatically in Streamlit on Windows
 # So we load it explicitly here
@@ -96,7 +102,26 @@ with st.sidebar:
     
     st.divider()  # Horizontal line separator
     
-    # Section 2: Future plans
+    # Section 2: Advisor finder (ranked by research-area fit)
+    st.header("Find an Advisor")
+    matcher = get_matcher()
+    interests = st.text_input("Your research interests")
+    selected_areas = st.multiselect("Research areas", matcher.areas)
+    term = st.selectbox("Available in", ["Any term"] + matcher.terms)
+    if interests or selected_areas:
+        matches = matcher.match(
+            interests,
+            areas=selected_areas,
+            term=None if term == "Any term" else term,
+        )
+        if matches:
+            st.markdown(format_matches(matches))
+        else:
+            st.caption("No available professors match those interests.")
+    
+    st.divider()  # Horizontal line separator
+    
+    # Section 3: Future plans
     st.header("Coming Next")
     st.markdown("""
     **Phase 2: RAG Integration**
@@ -108,7 +133,7 @@ with st.sidebar:
     
     st.divider()  # Another horizontal line
     
-    # Section 3: Project info
+    # Section 4: Project info
     st.markdown("**Built for BSU CS Graduate Students**")
     st.caption("CS557 - Natural Language Processing Project")
 
@@ -125,32 +150,60 @@ if not os.getenv("HUGGINGFACE_API_TOKEN"):
 # Session state keeps data persistent across page reloads
 # Think of it as the chatbot's "memory"
 
+# Each browser session gets a random id, kept in the URL (?sid=...) as a
+# signed token so reloading the page brings the same conversation back.
+# Only tokens signed by this server are accepted (a made-up or guessed id
+# starts a new conversation), but the full link itself works like a
+# password: anyone who has it can read that conversation.
+if "session_id" not in st.session_state:
+    token = st.query_params.get("sid")
+    session_id = session_from_token(token)
+    if session_id is None:
+        token = new_session_token()
+        session_id = session_from_token(token)
+        st.query_params["sid"] = token
+    st.session_state.session_id = session_id
+
 # Initialize message history
-if "messages" not in st.session_state:
-    # If this is the first time loading the page, create empty message list
-    st.session_state.messages = []
+# All messages are saved in SQLite; only the most recent ones stay in memory
+if "chat" not in st.session_state:
+    st.session_state.chat = ChatWindow(get_chat_store(), st.session_state.session_id, size=HISTORY_WINDOW)
+    st.session_state.older_pages = 0  # How many pages of older messages to show
     
-    # Add a welcome message from the assistant
-    welcome_msg = {
-        "role": "assistant",  # This message is from the AI
-        "content": "Hi! I'm your BSU Graduate Advisor AI. I can help you learn about CS faculty, their research areas, availability, and guide you through the advisor selection process. What would you like to know?"
-    }
-    st.session_state.messages.append(welcome_msg)
+    if len(st.session_state.chat) == 0:
+        # If this is the first time loading the page, add a welcome message
+        st.session_state.chat.append(
+            "assistant",  # This message is from the AI
+            "Hi! I'm your BSU Graduate Advisor AI. I can help you learn about CS faculty, their research areas, availability, and guide you through the advisor selection process. What would you like to know?"
+        )
 
-# Initialize the response engine (our AI)
-if "generator" not in st.session_state:
-    # If this is first time, create the ResponseEngine
-    with st.spinner("Initializing AI assistant..."):  # Show loading message
-        st.session_state.generator = ResponseEngine()  # Create the AI engine
-        #st.success("AI assistant ready!", icon="🎉")  # Show success message
+# Get the response engine (our AI)
+# It is shared by every browser session in this server process,
+# so only the chat window above is stored per session
+with st.spinner("Initializing AI assistant..."):  # Show loading message
+    generator = get_response_engine()
+    #st.success("AI assistant ready!", icon="🎉")  # Show success message
 
 # ==================== DISPLAY CHAT HISTORY ====================
-# Show all previous messages in the conversation
+# Show the recent messages in the conversation
+# Older messages are only loaded from the database when asked for
 
-for message in st.session_state.messages:
-    # For each message in history, display it in a chat bubble
-    with st.chat_message(message["role"]):  # "user" or "assistant"
-        st.write(message["content"])  # The actual message text
+chat = st.session_state.chat
+
+if chat.older_count() > 0:
+    if st.button("Load earlier messages"):
+        st.session_state.older_pages += 1
+    if st.session_state.older_pages:
+        with st.expander("Earlier messages", expanded=True):
+            for message in chat.older(st.session_state.older_pages, HISTORY_WINDOW):
+                with st.chat_message(message["role"]):
+                    st.write(message["content"])
+
+with METRICS.span("render_history"):
+    for message in chat:
+        # For each recent message, display it in a chat bubble
+        with st.chat_message(message["role"]):  # "user" or "assistant"
+            st.write(message["content"])  # The actual message text
 
 # ==================== CHAT INPUT ====================
 # This is where the user types their question
@@ -165,10 +218,8 @@ if user_query := st.chat_input("Ask me anything about graduate advising at BSU..
     
     # STEP 2: Add user's message to history
     # This ensures the AI remembers what the user just asked
-    st.session_state.messages.append({
-        "role": "user",
-        "content": user_query
-    })
+    history = chat.history()  # Recent messages (not including this one)
+    chat.append("user", user_query)
     
     # STEP 3: Generate AI response
     with st.chat_message("assistant"):
@@ -176,19 +227,41 @@ if user_query := st.chat_input("Ask me anything about graduate advising at BSU..
         with st.spinner("Thinking..."):
             # Call the response engine to generate an answer
             # Pass conversation history so AI has context
-            answer = st.session_state.generator.generate_answer(
+            answer = generator.generate_answer(
                 user_query,  # The current question
-                history=st.session_state.messages[:-1]  # All previous messages (not including the one we just added)
+                history=history  # Recent previous messages
             )
         # Display the AI's response
         st.write(answer)
     
     # STEP 4: Add AI's response to history
     # This ensures future responses remember what the AI said
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": answer
-    })
+    chat.append("assistant", answer)
+
+# ==================== ADMIN PANEL ====================
+# Optional live latency metrics (drawn after the turn so numbers are current)
+
+with st.sidebar:
+    if st.checkbox("Show performance metrics"):
+        st.subheader("Latency (ms)")
+        st.table([
+            {"stage": stage, **stats}
+            for stage, stats in METRICS.summary().items()
+        ])
+        st.subheader("Counters")
+        counters = METRICS.counters()
+        small_requests = counters.get("tier_small_requests", 0)
+        if small_requests:
+            st.caption(f"Small-model escalation rate: "
+                       f"{counters.get('tier_escalations', 0) / small_requests:.0%}")
+        st.json(counters)
+        st.download_button("Export JSON", METRICS.to_json(), "metrics.json")
+        st.download_button("Export Prometheus", METRICS.to_prometheus(), "metrics.prom")
+        st.subheader("Memory (MB)")
+        st.table([
+            {"component": name, "MB": round(size / 1024 / 1024, 2)}
+            for name, size in memory_report(st.session_state).items()
+        ])
 
 # ==================== FOOTER ====================
 # Bottom of page with project info
@@ -0,0 +1,168 @@
+# engines.py - Process-wide shared engines and memory accounting
+#
+# Heavy objects (language models, spaCy, FAISS index) are created once per
+# server process and shared by every Streamlit session. Sessions only keep
+# lightweight state like their chat messages.
+import sys
+import threading
+from collections import deque
+
+_lock = threading.Lock()  # guards _locks only
+_locks = {}               # name -> lock held while that instance is created
+_instances = {}
+
+# Sizes that are expensive to measure, computed once when the object is created
+_sizes = {}
+
+
+def _shared(name, factory):
+    """
+    Return the shared instance called `name`, creating it on first use.
+    Only callers of the same name wait while it is being created.
+    """
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            name_lock = _locks.setdefault(name, threading.Lock())
+        with name_lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = _instances[name] = factory()
+    return instance
+
+
+# ==================== SHARED ENGINES ====================
+
+def get_local_engine():
+    """Local FLAN-T5 fallback model (weights load on first generation)."""
+    from local_engine import LocalEngine
+    return _shared("local_engine", LocalEngine)
+
+
+def get_matcher():
+    """Vectorized advisor matcher over data/mock_professors.json."""
+    from matcher import AdvisorMatcher
+    return _shared("matcher", AdvisorMatcher.from_json)
+
+
+def get_name_index():
+    """Professor name resolution index over data/mock_professors.json."""
+    from name_index import NameIndex
+    return _shared("name_index", NameIndex.from_json)
+
+
+def get_response_engine():
+    """Groq response engine, falling back to the shared local model."""
+    from response_engine import ResponseEngine
+    return _shared(
+        "response_engine",
+        lambda: ResponseEngine(
+            local_engine=get_local_engine(),
+            matcher=get_matcher(),
+            name_index=get_name_index(),
+        ),
+    )
+
+
+def get_nlp_engine():
+    """BART intent classifier + name index (spaCy NER as fallback)."""
+    from nlp_engine import NLPEngine
+
+    def build():
+        engine = NLPEngine(name_index=get_name_index())
+        if engine.nlp is not None:
+            # Serializing the spaCy pipeline is slow - do it once, not per report
+            _sizes["spacy"] = len(engine.nlp.to_bytes())
+        return engine
+    return _shared("nlp_engine", build)
+
+
+def get_index():
+    """Record texts, embedding model and FAISS index (legacy RAG app)."""
+    def build():
+        from older_version.data_loader import build_index_streaming
+        model, index, texts = build_index_streaming()
+        return {"texts": texts, "model": model, "index": index}
+    return _shared("index", build)
+
+
+def get_chat_store():
+    """SQLite chat history for all sessions."""
+    from chat_store import ChatStore
+    return _shared("chat_store", ChatStore)
+
+
+# ==================== MEMORY ACCOUNTING ====================
+
+def _tensor_bytes(value):
+    """Bytes used by a tensor, or by tensors nested in tuples/lists."""
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return value.element_size() * value.nelement()
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    return 0
+
+
+def _torch_model_bytes(model):
+    """Weight bytes of a torch module (also counts int8 packed weights)."""
+    if model is None or not hasattr(model, "state_dict"):
+        return 0
+    return sum(_tensor_bytes(v) for v in model.state_dict().values())
+
+
+def _deep_sizeof(obj, seen=None):
+    """Approximate size of plain Python containers (session state)."""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen or any(obj is shared for shared in _instances.values()):
+        return 0  # shared engines are reported separately
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+def memory_report(session_state=None):
+    """
+    Bytes held by each shared model, the index and (optionally) one session.
+
+    Only objects that have already been created are measured - calling this
+    never loads a model.
+
+    Returns:
+        Dict: component name -> bytes
+    """
+    report = {}
+
+    local = _instances.get("local_engine")
+    if local is not None:
+        report["local_model"] = _torch_model_bytes(local._model)
+
+    nlp = _instances.get("nlp_engine")
+    if nlp is not None:
+        report["bart_classifier"] = _torch_model_bytes(nlp.classifier.model)
+        if "spacy" in _sizes:
+            report["spacy"] = _sizes["spacy"]
+
+    matcher = _instances.get("matcher")
+    if matcher is not None:
+        report["matcher"] = (matcher.faculty_areas.nbytes + matcher.area_terms.nbytes
+                             + matcher.term_avail.nbytes + matcher.accepting.nbytes
+                             + matcher.open_now.nbytes)
+
+    index = _instances.get("index")
+    if index is not None:
+        report["embedding_model"] = _torch_model_bytes(index["model"])
+        report["faiss_index"] = index["index"].ntotal * index["index"].d * 4
+        report["text_offsets"] = index["texts"]._offsets.nbytes
+
+    if session_state is not None:
+        report["session"] = sum(
+            _deep_sizeof(session_state[key]) for key in list(session_state.keys())
+        )
+
+    return report
@@ -0,0 +1,186 @@
+# matcher.py - Vectorized advisor matching with availability filters
+import json
+import re
+import numpy as np
+
+FACULTY_PATH = "data/mock_professors.json"
+
+TERM_PATTERN = re.compile(r"\b(spring|summer|fall)\s+(\d{4})\b", re.IGNORECASE)
+NOT_ACCEPTING = "not taking students"
+OPEN_NOW = "open now"
+SEASONS = {"Spring": 0, "Summer": 1, "Fall": 2}
+
+STOPWORDS = {"and", "the", "of", "in", "on", "for", "with", "a", "an", "to", "i", "am", "me", "my"}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords."""
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+def acronym(area):
+    """'Human-Computer Interaction' -> 'hci' (single words have no acronym)."""
+    words = re.findall(r"[A-Za-z]+", area)
+    return "".join(w[0] for w in words).lower() if len(words) > 1 else None
+
+
+def parse_term(text):
+    """Find a term like 'Spring 2026' in free text (normalized), or None."""
+    match = TERM_PATTERN.search(text)
+    return f"{match.group(1).title()} {match.group(2)}" if match else None
+
+
+class AdvisorMatcher:
+    """
+    Scores a student's interests against every faculty member at once.
+
+    Precomputed at init:
+        faculty_areas: (faculty x areas) 0/1 matrix
+        area_terms:    (areas x vocabulary) normalized token vectors
+        term_avail:    (faculty x terms) boolean matrix, True = available in terms[j]
+        open_now:      boolean mask of faculty available in any term
+        accepting:     boolean mask of faculty taking students
+
+    A match is then: area affinity = area_terms @ query_vector,
+    breakdown = faculty_areas * affinity, score = breakdown.sum(axis=1).
+    """
+
+    def __init__(self, faculty):
+        """
+        Args:
+            faculty: List of dicts with "name", "areas" and "availability"
+                     (same format as data/mock_professors.json)
+        """
+        self.faculty = faculty
+        self.names = [f["name"] for f in faculty]
+
+        # Area vocabulary and faculty x area matrix
+        self.areas = sorted({a for f in faculty for a in f["areas"]})
+        self.area_index = {a.lower(): i for i, a in enumerate(self.areas)}
+        self.faculty_areas = np.zeros((len(faculty), len(self.areas)), dtype=np.float32)
+        for row, f in enumerate(faculty):
+            for a in f["areas"]:
+                self.faculty_areas[row, self.area_index[a.lower()]] = 1.0
+
+        # Token vectors describing each area (words + acronym)
+        area_tokens = []
+        for a in self.areas:
+            tokens = tokenize(a)
+            if acronym(a):
+                tokens.append(acronym(a))
+            area_tokens.append(tokens)
+        self.vocab = {t: i for i, t in enumerate(sorted({t for ts in area_tokens for t in ts}))}
+        self.area_terms = np.zeros((len(self.areas), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(area_tokens):
+            for t in tokens:
+                self.area_terms[row, self.vocab[t]] = 1.0
+        # Words shared by many areas ("computer", "systems") count less
+        self.idf = np.log1p(len(self.areas) / self.area_terms.sum(axis=0)).astype(np.float32)
+        self.area_terms *= self.idf
+        norms = np.linalg.norm(self.area_terms, axis=1, keepdims=True)
+        self.area_terms /= np.where(norms > 0, norms, 1.0)
+
+        # Availability masks
+        availability = [f.get("availability", "") for f in faculty]
+        # Terms in calendar order (Spring, Summer, Fall within a year)
+        self.terms = sorted({parse_term(a) for a in availability if parse_term(a)},
+                            key=lambda t: (t.split()[1], SEASONS[t.split()[0]]))
+        self.term_index = {t: j for j, t in enumerate(self.terms)}
+        self.accepting = np.array(
+            [NOT_ACCEPTING not in a.lower() for a in availability], dtype=bool
+        )
+        self.open_now = np.array(
+            [OPEN_NOW in a.lower() for a in availability], dtype=bool
+        )
+        self.term_avail = np.zeros((len(faculty), len(self.terms)), dtype=bool)
+        for row, a in enumerate(availability):
+            term = parse_term(a)
+            if term:
+                self.term_avail[row, self.term_index[term]] = True
+
+    @classmethod
+    def from_json(cls, path=FACULTY_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    # ==================== SCORING ====================
+
+    def _query_vector(self, text):
+        vector = np.zeros(len(self.vocab), dtype=np.float32)
+        for t in tokenize(text):
+            index = self.vocab.get(t)
+            if index is not None:
+                vector[index] += self.idf[index]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def area_affinity(self, text="", areas=None):
+        """How strongly the student's interests relate to each area (0..1)."""
+        affinity = self.area_terms @ self._query_vector(text)
+        for a in areas or []:
+            index = self.area_index.get(a.lower())
+            if index is not None:
+                affinity[index] = 1.0  # explicitly selected areas count fully
+        return affinity
+
+    def filter_mask(self, term=None, accepting_only=True):
+        """Boolean mask of faculty passing the hard filters."""
+        mask = self.accepting.copy() if accepting_only else np.ones(len(self.faculty), dtype=bool)
+        if term is not None:
+            # "Open Now" faculty qualify for any term, including ones nobody lists
+            available = self.open_now.copy()
+            column = self.term_index.get(term)
+            if column is not None:
+                available |= self.term_avail[:, column]
+            mask &= available
+        return mask
+
+    def match(self, text="", areas=None, term=None, accepting_only=True, k=5):
+        """
+        Rank faculty for a student interest profile.
+
+        Args:
+            text: Free-text interests ("I like computer vision and AI")
+            areas: Areas the student selected explicitly
+            term: Only faculty available in this term (e.g. "Spring 2026")
+            accepting_only: Skip faculty not taking students
+            k: Number of results
+
+        Returns:
+            List of dicts (best first) with name, score, availability and
+            a per-area score breakdown. Faculty scoring 0 are left out.
+        """
+        affinity = self.area_affinity(text, areas)
+        breakdown = self.faculty_areas * affinity
+        scores = breakdown.sum(axis=1)
+        scores[~self.filter_mask(term, accepting_only)] = 0.0
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for row in top:
+            if scores[row] <= 0:
+                break
+            results.append({
+                "name": self.names[row],
+                "score": round(float(scores[row]), 3),
+                "availability": self.faculty[row].get("availability", ""),
+                "breakdown": {
+                    self.areas[j]: round(float(breakdown[row, j]), 3)
+                    for j in np.flatnonzero(breakdown[row])
+                },
+            })
+        return results
+
+
+def format_matches(matches):
+    """Turn match results into lines for the LLM prompt or the UI."""
+    lines = []
+    for m in matches:
+        areas = ", ".join(f"{a} ({s:.2f})" for a, s in m["breakdown"].items())
+        lines.append(f"- {m['name']} (score {m['score']:.2f}, {m['availability']}): {areas}")
+    return "\n".join(lines)
@@ -0,0 +1,158 @@
+# metrics.py - Lightweight latency tracing and metrics for the advisor pipeline
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds (Prometheus style, +Inf is implicit)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Latency histogram for one pipeline stage.
+    Keeps cumulative bucket counts for export and a window of recent
+    samples for live p50/p95.
+    """
+
+    def __init__(self, buckets=BUCKETS, window=1024):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def percentile(self, q):
+        """q-th percentile (0-100) over the recent window, or None if empty."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class Metrics:
+    """
+    Process-wide registry of stage latencies and counters.
+
+    Usage:
+        with METRICS.span("retrieve_info"):
+            ...
+        METRICS.inc("groq_retries")
+    """
+
+    def __init__(self, prefix="advisor"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    # ==================== RECORDING ====================
+
+    def observe(self, stage, seconds):
+        """Record one latency sample for a stage."""
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name, amount=1):
+        """Increase a counter (retries, tokens, errors...)."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block of code and record it under `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator version of span()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # ==================== READING ====================
+
+    def summary(self):
+        """
+        Per-stage statistics for display.
+
+        Returns:
+            Dict: stage -> {"count", "mean_ms", "p50_ms", "p95_ms"}
+        """
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        with self._lock:
+            return {
+                stage: {
+                    "count": hist.count,
+                    "mean_ms": ms(hist.total / hist.count) if hist.count else None,
+                    "p50_ms": ms(hist.percentile(50)),
+                    "p95_ms": ms(hist.percentile(95)),
+                }
+                for stage, hist in sorted(self._histograms.items())
+            }
+
+    def counters(self):
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    # ==================== EXPORT ====================
+
+    def to_json(self):
+        """Export all metrics as a JSON string."""
+        return json.dumps(
+            {"stages": self.summary(), "counters": self.counters()},
+            indent=2,
+        )
+
+    def to_prometheus(self):
+        """Export all metrics in Prometheus text exposition format."""
+        name = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Latency of advisor pipeline stages.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, hist in sorted(self._histograms.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {hist.total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+
+            for counter, value in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{counter}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used by every module in the app
+METRICS = Metrics()
@@ -0,0 +1,236 @@
+# name_index.py - Fast professor name resolution (token trie + fuzzy matching)
+import json
+import re
+
+FACULTY_PATH = "data/mock_professors.json"
+
+TITLES = {"dr", "doctor", "prof", "professor", "mr", "mrs", "ms"}
+
+# Hits scoring below MIN_SCORE (fuzzy or ambiguous) are only suggestions:
+# callers do not treat them as a professor being named
+MIN_SCORE = 0.5
+# Hits that might not be a name at all - a lone lowercase token ("my
+# defense fails") or a typo ("zhaung") - score at most this
+SUGGESTION_SCORE = 0.45
+
+
+def normalize(text):
+    """Lowercase word tokens with punctuation removed."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def query_tokens(text):
+    """
+    Lowercase tokens of a query, plus for each one whether it looks like a
+    proper noun (capitalized and not the first word of a sentence).
+    """
+    tokens, proper = [], []
+    sentence_start = True
+    for match in re.finditer(r"[A-Za-z0-9]+|[.!?]", text):
+        word = match.group(0)
+        if word in ".!?":
+            sentence_start = True
+            continue
+        tokens.append(word.lower())
+        proper.append(word[0].isupper() and not sentence_start)
+        sentence_start = False
+    return tokens, proper
+
+
+def name_tokens(name):
+    """Tokens of a faculty name without titles ('Dr. Jun Zhuang' -> ['jun', 'zhuang'])."""
+    return [t for t in normalize(name) if t not in TITLES]
+
+
+def professor_id(name):
+    """Canonical id for a faculty member ('Dr. Jun Zhuang' -> 'jun-zhuang')."""
+    return "-".join(name_tokens(name))
+
+
+def edit_distance(a, b, limit):
+    """
+    Edit distance counting swapped neighbours as one edit ("zhaung" -> "zhuang"),
+    or limit + 1 as soon as it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            )
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def trigrams(token):
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Resolves professor mentions in a query to canonical professor ids.
+
+    Aliases (full name, first + last, and every contiguous part of the
+    name such as "barney smith" or "zhuang") are stored in a token trie, so
+    a query is scanned left to right with a longest-match walk. Tokens that
+    match nothing exactly are checked against a character-trigram index and
+    accepted if they are within a small edit distance of a name token
+    (e.g. "zhaung" -> Zhuang).
+
+    A single-token hit is only trusted when the token follows a title
+    ("Dr. Fails") or is capitalized mid-sentence ("ask Fails"). Otherwise
+    ("my defense fails") it is returned as a suggestion scoring at most
+    SUGGESTION_SCORE, below MIN_SCORE. Fuzzy hits are always suggestions
+    and are only looked for on title-led or capitalized tokens.
+    """
+
+    _END = "__ids__"
+
+    def __init__(self, faculty):
+        """
+        Args:
+            faculty: List of dicts with at least "name"
+                     (same format as data/mock_professors.json)
+        """
+        self.records = {}
+        self.trie = {}
+        self.token_ids = {}   # single name token -> ids
+        self.grams = {}       # trigram -> name tokens containing it
+        self._fuzzy_cache = {}  # query token -> fuzzy matches
+
+        for record in faculty:
+            pid = professor_id(record["name"])
+            self.records[pid] = record
+            tokens = name_tokens(record["name"])
+
+            aliases = {tuple(tokens[i:j]) for i in range(len(tokens))
+                       for j in range(i + 1, len(tokens) + 1)}
+            if len(tokens) > 2:
+                aliases.add((tokens[0], tokens[-1]))
+            for alias in aliases:
+                self._insert(alias, pid)
+
+            for token in tokens:
+                self.token_ids.setdefault(token, set()).add(pid)
+                for gram in trigrams(token):
+                    self.grams.setdefault(gram, set()).add(token)
+
+    @classmethod
+    def from_json(cls, path=FACULTY_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def _insert(self, tokens, pid):
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self._END, set()).add(pid)
+
+    # ==================== LOOKUP ====================
+
+    def _fuzzy(self, token):
+        """Name tokens within edit distance 1 (2 for long tokens) of `token`."""
+        if len(token) < 4:
+            return {}
+        cached = self._fuzzy_cache.get(token)
+        if cached is not None:
+            return cached
+
+        limit = 1 if len(token) <= 6 else 2
+        grams = trigrams(token)
+        shared = {}
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        # Each edit changes at most ~4 trigrams, so candidates sharing fewer
+        # cannot be within the limit - skip the edit distance for those
+        min_shared = max(1, len(grams) - 4 * limit)
+        matches = {}
+        for candidate, count in shared.items():
+            if count < min_shared or abs(len(candidate) - len(token)) > limit:
+                continue
+            distance = edit_distance(token, candidate, limit)
+            if distance <= limit:
+                matches[candidate] = distance
+
+        if len(self._fuzzy_cache) >= 10000:
+            self._fuzzy_cache.clear()
+        self._fuzzy_cache[token] = matches
+        return matches
+
+    def resolve(self, text, fuzzy=True):
+        """
+        Find professor mentions in text.
+
+        Returns:
+            List of dicts (in order of appearance) with:
+                id, name, mention, score (1.0 = exact, lower = fuzzy / ambiguous)
+        """
+        tokens, proper = query_tokens(text)
+        results = []
+        seen = set()
+        i = 0
+        while i < len(tokens):
+            # Longest exact alias starting at token i
+            node, end, ids = self.trie, i, None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if self._END in node:
+                    end, ids = j + 1, node[self._END]
+
+            # A lone token is only marked as a name by a title or a capital
+            name_like = (i > 0 and tokens[i - 1] in TITLES) or proper[i]
+
+            if ids:
+                mention = " ".join(tokens[i:end])
+                score = 1.0 if end - i > 1 or name_like else SUGGESTION_SCORE
+                score /= len(ids)
+                i = end
+            elif fuzzy and name_like and tokens[i] not in TITLES:
+                matches = self._fuzzy(tokens[i])
+                ids = {}
+                for candidate, distance in matches.items():
+                    for pid in self.token_ids[candidate]:
+                        ids[pid] = min(ids.get(pid, distance), distance)
+                mention = tokens[i]
+                score = None
+                i += 1
+            else:
+                i += 1
+                continue
+
+            for pid in sorted(ids):
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                if score is None:
+                    similarity = 1 - ids[pid] / (len(mention) + 1)
+                    pid_score = round(SUGGESTION_SCORE * similarity / len(ids), 3)
+                else:
+                    pid_score = round(score, 3)
+                results.append({
+                    "id": pid,
+                    "name": self.records[pid]["name"],
+                    "mention": mention,
+                    "score": pid_score,
+                })
+        return results
+
+    def lookup(self, pid):
+        """Faculty record for a professor id."""
+        return self.records.get(pid)
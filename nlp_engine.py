@@ -1,8 +1,10 @@
 from transformers  import pipeline
-import spacy
+import threading
+from metrics import METRICS
+from name_index import NameIndex, MIN_SCORE
 
 class NLPEngine:
-    def __init__(self):
+    def __init__(self, name_index=None, use_ner_fallback=True):
         self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
         self.labels = [
             "find_professor_by_area",
@@ -11,22 +13,44 @@ class NLPEngine:
         ]
 
         self.keywords = ["AI", "machine learning", "data science", "professor", "faculty", "research", "availability", "office hours", "data science"]
-        self.nlp = spacy.load("en_core_web_sm")
+        # Professor names are resolved with the faculty name index;
+        # spaCy NER only runs when the index finds no professor
+        self.name_index = name_index or NameIndex.from_json()
+        self.nlp = None
+        if use_ner_fallback:
+            import spacy  # optional: only needed for the NER fallback
+            self.nlp = spacy.load("en_core_web_sm")
 
+        # One NLPEngine is shared by all sessions (see engines.py);
+        # the models are not guaranteed thread-safe, so calls are serialized
+        self._lock = threading.Lock()
+
+    @METRICS.timed("analyze_query")
     def analyze_query(self, query):
         #intent detection
-        intent_result = self.classifier(query, candidate_labels=self.labels)
-        intent = intent_result['labels'][0]
+        with METRICS.span("nlp_intent"), self._lock:
+            intent_result = self.classifier(query, candidate_labels=self.labels)
+            intent = intent_result['labels'][0]
 
         #keyword detection
-        found_keywords = [word for word in self.keywords if word.lower() in query.lower()]
+        with METRICS.span("nlp_keywords"):
+            found_keywords = [word for word in self.keywords if word.lower() in query.lower()]
+
+        #professor name resolution
+        with METRICS.span("nlp_names"):
+            # Low-scoring (fuzzy / ambiguous) hits are not treated as names
+            professors = [p for p in self.name_index.resolve(query) if p["score"] >= MIN_SCORE]
+            entities = [(p["mention"], "PERSON") for p in professors]
 
-        #named entity recognition
-        doc = self.nlp(query)
-        entities = [(ent.text, ent.label_) for ent in doc.ents]
+        #named entity recognition (fallback)
+        if not professors and self.nlp is not None:
+            with METRICS.span("nlp_ner"), self._lock:
+                doc = self.nlp(query)
+                entities = [(ent.text, ent.label_) for ent in doc.ents]
 
         return {
             "intent": intent,
             "keywords": found_keywords,
-            "entities": entities
+            "entities": entities,
+            "professors": [p["id"] for p in professors]
         }
\ No newline at end of file
@@ -1,17 +1,15 @@
 import streamlit as st
-from older_version.data_loader import load_data, build_index
 from older_version.rag_engine import retrieve_info, generate_response 
+from engines import get_index
 
 st.set_page_config(page_title="Academic Advisor AI", layout="wide")
 st.title("Academic Advisor AI")
 st.caption("Ask questions about university professors and their research areas."
 )
 
-@st.cache_resource
 def setup():
-    df = load_data()
-    model, index, embeddings = build_index(df)
-    return df, model, index
+    shared = get_index()  # built once per process, shared by all sessions
+    return shared["texts"], shared["model"], shared["index"]
 df, model, index = setup()
 
 if "chat" not in st.session_state:
@@ -1,17 +1,152 @@
+import os
+import tempfile
+import weakref
+from array import array
+import time
+from contextlib import contextmanager
 import pandas as pd
 from sentence_transformers import SentenceTransformer
 import numpy as np
 import faiss
 
+DATA_PATH = 'data/professors.csv'
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 
-def load_data():
-    df = pd.read_csv('data/professors.csv')
-    df["text"] = df.apply(lambda x: f"{x['Name']} works on {x['Research_Areas']}. {x['Summary']}", axis=1)
+
+def format_text(df):
+    # Vectorized string building (much faster than a row-wise apply)
+    return (
+        df["Name"].fillna("") + " works on " + df["Research_Areas"].fillna("")
+        + ". " + df["Summary"].fillna("")
+    )
+
+def load_data(path=DATA_PATH):
+    df = pd.read_csv(path)
+    df["text"] = format_text(df)
     return df
 
-def build_index(df):
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    embeddings = model.encode(df["text"].tolist(), convert_to_numpy=True)
+def build_index(df, batch_size=64):
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    embeddings = model.encode(df["text"].tolist(), batch_size=batch_size, convert_to_numpy=True)
     index = faiss.IndexFlatL2(embeddings.shape[1])
     index.add(embeddings)
-    return model,index, embeddings
\ No newline at end of file
+    return model,index, embeddings
+
+
+def iter_chunks(path=DATA_PATH, chunksize=10000):
+    """Read the CSV a chunk at a time, with the `text` column already built."""
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+        chunk["text"] = format_text(chunk)
+        yield chunk
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class TextStore:
+    """
+    Record texts kept on disk instead of in a DataFrame.
+
+    Only one 8-byte offset per record stays in memory; retrieve_info reads
+    the few texts it needs with texts(ids). Without a `path` the texts go to
+    a temporary file, deleted when the store is garbage collected (or at exit).
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix=".texts")
+            os.close(fd)
+            weakref.finalize(self, _remove, path)
+        self.path = path
+        self._file = open(path, "wb")
+        self._offsets = array("q", [0])  # 8 bytes per record
+
+    def append(self, texts):
+        for text in texts:
+            data = text.encode("utf-8")
+            self._file.write(data)
+            self._offsets.append(self._offsets[-1] + len(data))
+
+    def close(self):
+        """Finish writing; the store is read-only afterwards."""
+        self._file.close()
+        self._offsets = np.frombuffer(self._offsets, dtype=np.int64)
+
+    def texts(self, ids):
+        with open(self.path, "rb") as f:
+            result = []
+            for i in ids:
+                f.seek(self._offsets[i])
+                result.append(f.read(self._offsets[i + 1] - self._offsets[i]).decode("utf-8"))
+            return result
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+@contextmanager
+def _single_threaded_workers():
+    """Worker processes started inside this block use one torch thread each."""
+    names = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+    saved = {name: os.environ.get(name) for name in names}
+    os.environ.update({name: "1" for name in names})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def build_index_streaming(path=DATA_PATH, chunksize=10000, batch_size=128,
+                          num_workers=None, progress=print):
+    """
+    Build the FAISS index for a large corpus in bounded memory.
+
+    Records are read in chunks, encoded and added to the index as each
+    chunk is done. Texts go to an on-disk TextStore, so apart from the
+    index itself memory use does not grow with the corpus. Once the corpus
+    is bigger than one chunk, encoding moves to a pool of worker processes
+    (one per CPU core by default, one torch thread each).
+
+    Returns:
+        model, index, texts - row i of texts matches vector i of the index
+        (retrieve_info accepts texts in place of the DataFrame)
+    """
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    num_workers = num_workers or os.cpu_count() or 1
+    pool = None
+
+    index = faiss.IndexFlatL2(model.get_sentence_embedding_dimension())
+    store = TextStore()
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(path, chunksize):
+            texts = chunk["text"].tolist()
+            if pool is None and num_workers > 1 and len(texts) == chunksize:
+                # Large corpus - worth starting the worker processes
+                with _single_threaded_workers():
+                    pool = model.start_multi_process_pool(["cpu"] * num_workers)
+            if pool is not None:
+                embeddings = model.encode_multi_process(
+                    texts, pool, batch_size=batch_size,
+                    chunk_size=max(batch_size, len(texts) // num_workers),
+                )
+            else:
+                embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+            index.add(np.ascontiguousarray(embeddings, dtype=np.float32))
+            store.append(texts)
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(f"Indexed {index.ntotal} records "
+                         f"({index.ntotal / elapsed:.0f} records/s)")
+    finally:
+        store.close()
+        if pool is not None:
+            model.stop_multi_process_pool(pool)
+
+    return model, index, store
@@ -1,21 +1,27 @@
 import numpy as np
-from transformers import pipeline
-
-# Use text2text-generation for FLAN models
-generator = pipeline("text2text-generation", model="google/flan-t5-base")
+from engines import get_local_engine
+from metrics import METRICS
 
+@METRICS.timed("retrieve_info")
 def retrieve_info(query, model, index, df, k=2):
+    # df: the professors DataFrame, or the TextStore from build_index_streaming
     q_emb = model.encode([query], convert_to_numpy=True)
     D, I = index.search(np.array(q_emb), k)
-    results = df.iloc[I[0]]
-    context = "\n".join(results["text"].tolist())
+    ids = [i for i in I[0] if i >= 0]
+    if hasattr(df, "texts"):  # TextStore from build_index_streaming
+        texts = df.texts(ids)
+    else:
+        texts = df.iloc[ids]["text"].tolist()
+    context = "\n".join(texts)
     return context
 
+@METRICS.timed("generate_response")
 def generate_response(query, context):
     prompt = (
         f"You are an academic advisor AI. Use only the context below.\n\n"
         f"Context:\n{context}\n\n"
         f"Question: {query}\nAnswer:"
     )
-    output = generator(prompt, max_length=200, num_return_sequences=1)
-    return output[0]["generated_text"].split("Answer:")[-1].strip()
+    # Shared FLAN-T5 generator - loaded lazily on the first question
+    output = get_local_engine().generate(prompt)
+    return output.split("Answer:")[-1].strip()
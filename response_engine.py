@@ -1,24 +1,86 @@
 # response_engine.py - Groq API (Fast, Reliable, Free)
 import requests
 import os
+import re
 import time
+from metrics import METRICS
+from name_index import MIN_SCORE
 
 MODEL_NAME = "llama-3.3-70b-versatile"
+SMALL_MODEL_NAME = "llama-3.1-8b-instant"
+
+# Model cascade: greetings and small talk go to the small model,
+# everything else goes to the large one.
+# Prices are USD per million tokens (input, output), used for cost tracking.
+MODEL_TIERS = {
+    "small": {"model": SMALL_MODEL_NAME, "max_tokens": 120, "price": (0.05, 0.08)},
+    "large": {"model": MODEL_NAME, "max_tokens": 300, "price": (0.59, 0.79)},
+}
+
+# Greetings / small talk - the only turns the small model answers.
+# A query is chit-chat when it is made up entirely of these phrases
+# (plus a few filler words and punctuation), e.g. "Hello, how are you?"
+_CHAT_PHRASE = (
+    r"(hi|hello|hey|hiya|thanks|thank you|thx|ok|okay|cool|great|bye|goodbye|see you"
+    r"|good (morning|afternoon|evening|night)|how are you( doing)?|who are you"
+    r"|what can you do|nice to meet you)"
+    r"(\s+(there|again|so much|very much|a lot|today|too))*"
+)
+CHIT_CHAT = re.compile(
+    rf"\s*{_CHAT_PHRASE}([\s,.!?]+{_CHAT_PHRASE})*[\s,.!?]*",
+    re.IGNORECASE,
+)
+
+
+def classify_complexity(user_query, grounded=False):
+    """
+    Pick the model tier for a query: "small" or "large".
+    
+    Only pure chit-chat goes to the small model. Anything that mentions a
+    professor or a research area (grounded=True: the name index or the
+    matcher found something), or is not plain small talk, goes to the
+    large model.
+    """
+    if grounded:
+        return "large"
+    return "small" if CHIT_CHAT.fullmatch(user_query) else "large"
+
 class ResponseEngine:
     """
     Response engine using Groq API with Llama 3.
     Fast, reliable, and free tier is generous.
     """
     
-    def __init__(self):
-        """Initialize Groq API connection."""
+    def __init__(self, local_engine=None, matcher=None, name_index=None):
+        """
+        Initialize Groq API connection.
+        
+        Args:
+            local_engine: Optional LocalEngine used when Groq is unreachable
+                          (or when no GROQ_API_KEY is set at all)
+            matcher: Optional AdvisorMatcher; its top matches for each
+                     question are added to the prompt
+            name_index: Optional NameIndex; professors named in the question
+                        are looked up directly (skipping the matcher)
+        """
+        
+        # Local CPU model for degraded-but-fast offline answers
+        self.local_engine = local_engine
+        
+        # Ranks faculty by research fit so the LLM doesn't have to
+        self.matcher = matcher
+        
+        # Resolves "Dr. X" mentions to faculty records
+        self.name_index = name_index
         
         # Load Groq API key from environment
         self.api_key = os.getenv("GROQ_API_KEY", "")
         
         if not self.api_key:
             print("⚠️ WARNING: No GROQ_API_KEY found!")
-            raise ValueError("GROQ_API_KEY required in .env file")
+            if self.local_engine is None:
+                raise ValueError("GROQ_API_KEY required in .env file")
+            print("⚠️ Running in offline mode with the local model")
         
         # Groq API endpoint
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
@@ -58,8 +120,9 @@ Your role:
 
 Keep responses concise (2-4 sentences) but helpful. Always try to guide the conversation toward helping them find the right advisor."""
         
-        print(f"✅ Groq API initialized with {self.model}")
+        print(f"✅ Groq API initialized with {self.model} (simple turns: {SMALL_MODEL_NAME})")
     
+    @METRICS.timed("generate_answer")
     def generate_answer(self, user_query, history=None):
         """
         Generate intelligent response using Groq API.
@@ -73,55 +136,127 @@ Keep responses concise (2-4 sentences) but helpful. Always try to guide the conv
         """
         
         # Build messages array for the API
-        messages = [
-            {"role": "system", "content": self.system_prompt}
-        ]
-        
-        # Add conversation history (keep last 6 messages for context)
-        if history:
-            for msg in history[-6:]:
+        with METRICS.span("prompt_assembly"):
+            messages = [
+                {"role": "system", "content": self.system_prompt}
+            ]
+            
+            # Add the professors named in the question, or else
+            # ranked faculty matches for it (if any)
+            named = self._lookup_faculty(user_query)
+            matches = ""
+            if named:
                 messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
+                    "role": "system",
+                    "content": "Faculty mentioned in this question:\n" + named
                 })
-        
-        # Add current user query
-        messages.append({
-            "role": "user",
-            "content": user_query
-        })
-        
-        # Call Groq API
-        answer = self._query_groq(messages)
+            else:
+                matches = self._match_faculty(user_query)
+                if matches:
+                    messages.append({
+                        "role": "system",
+                        "content": "Best-matching faculty for this question "
+                                   "(score = research-area fit, filtered by availability):\n" + matches
+                    })
+            
+            # Add conversation history (keep last 6 messages for context)
+            if history:
+                for msg in history[-6:]:
+                    messages.append({
+                        "role": msg["role"],
+                        "content": msg["content"]
+                    })
+            
+            # Add current user query
+            messages.append({
+                "role": "user",
+                "content": user_query
+            })
+        
+        # Call Groq API - small model only for small talk
+        tier = classify_complexity(user_query, grounded=bool(named or matches))
+        answer, finish_reason = self._query_groq(messages, tier)
+        
+        # Escalate if the small model ran out of tokens or said nothing
+        if tier == "small" and (finish_reason == "length" or not answer):
+            METRICS.inc("tier_escalations")
+            answer, _ = self._query_groq(messages, "large")
         return answer
     
-    def _query_groq(self, messages, max_retries=3):
-        """Query Groq API with retry logic."""
+    def _lookup_faculty(self, user_query, min_score=MIN_SCORE):
+        """Records of professors named in the query, formatted for the prompt."""
+        if self.name_index is None:
+            return ""
+        with METRICS.span("name_resolve"):
+            professors = self.name_index.resolve(user_query)
+        lines = []
+        for p in professors:
+            if p["score"] < min_score:
+                continue
+            record = self.name_index.lookup(p["id"])
+            areas = ", ".join(record.get("areas", []))
+            lines.append(f"- {record['name']}: {areas} ({record.get('availability', 'availability unknown')})")
+        return "\n".join(lines)
+    
+    def _match_faculty(self, user_query, k=3):
+        """Top-k matcher results formatted for the prompt, or "" if none."""
+        if self.matcher is None:
+            return ""
+        from matcher import format_matches, parse_term
+        with METRICS.span("advisor_match"):
+            matches = self.matcher.match(user_query, term=parse_term(user_query), k=k)
+        return format_matches(matches)
+    
+    def _query_groq(self, messages, tier="large", max_retries=3):
+        """
+        Query Groq API with retry logic.
+        
+        Returns:
+            (answer, finish_reason) - finish_reason is None when the answer
+            did not come from Groq (local fallback or error message)
+        """
+        
+        if not self.api_key:
+            return self._query_local(messages), None
         
+        METRICS.inc(f"tier_{tier}_requests")
+        with METRICS.span(f"tier_{tier}"):
+            return self._post_groq(messages, tier, max_retries)
+    
+    def _post_groq(self, messages, tier, max_retries):
+        config = MODEL_TIERS[tier]
         payload = {
-            "model": self.model,
+            "model": config["model"],
             "messages": messages,
             "temperature": 0.7,
-            "max_tokens": 300,
+            "max_tokens": config["max_tokens"],
             "top_p": 0.9
         }
         
         for attempt in range(max_retries):
+            if attempt > 0:
+                METRICS.inc("groq_retries")
             try:
-                response = requests.post(
-                    self.api_url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30
-                )
+                with METRICS.span("groq_http"):
+                    response = requests.post(
+                        self.api_url,
+                        headers=self.headers,
+                        json=payload,
+                        timeout=30
+                    )
+                METRICS.inc(f"groq_status_{response.status_code}")
                 
                 if response.status_code == 200:
                     result = response.json()
-                    answer = result["choices"][0]["message"]["content"].strip()
-                    return answer
+                    self._record_usage(result, tier)
+                    choice = result["choices"][0]
+                    answer = choice["message"]["content"].strip()
+                    return answer, choice.get("finish_reason")
                 
                 elif response.status_code == 401:
-                    return "❌ Authentication error. Check your GROQ_API_KEY in the .env file."
+                    if self.local_engine is not None:
+                        return self._query_local(messages), None
+                    return "❌ Authentication error. Check your GROQ_API_KEY in the .env file.", None
                 
                 elif response.status_code == 429:
                     print(f"⏳ Rate limit, waiting... (attempt {attempt + 1})")
@@ -132,12 +267,38 @@ Keep responses concise (2-4 sentences) but helpful. Always try to guide the conv
                     print(f"API Error {response.status_code}: {response.text}")
                     
             except Exception as e:
+                METRICS.inc("groq_errors")
                 print(f"Error: {e}")
                 if attempt < max_retries - 1:
                     time.sleep(1)
                     continue
         
-        return "I'm having trouble connecting right now. Please try again in a moment."
+        if self.local_engine is not None:
+            return self._query_local(messages), None
+        
+        return "I'm having trouble connecting right now. Please try again in a moment.", None
+    
+    def _record_usage(self, result, tier):
+        """Add token counts (and estimated cost) from Groq's `usage` field to the metrics."""
+        usage = result.get("usage") or {}
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            if key in usage:
+                METRICS.inc(f"groq_{key}", usage[key])
+        
+        input_price, output_price = MODEL_TIERS[tier]["price"]
+        cost = (usage.get("prompt_tokens", 0) * input_price
+                + usage.get("completion_tokens", 0) * output_price) / 1_000_000
+        METRICS.inc(f"tier_{tier}_cost_usd", cost)
+    
+    def _query_local(self, messages):
+        """Answer with the local CPU model (Groq unavailable)."""
+        METRICS.inc("local_fallbacks")
+        try:
+            with METRICS.span("local_generate"):
+                return self.local_engine.chat(messages)
+        except Exception as e:
+            print(f"Local model error: {e}")
+            return "I'm having trouble connecting right now. Please try again in a moment."
 # # response_engine.py
 # # This file handles generating intelligent responses for the chatbot
 # # It uses Mistral-7B AI model through HuggingFace's free API